@@ -6,8 +6,8 @@ ASL Detector GUI Interface
 
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import cv2
+import numpy as np
 
 class ASLDetectorGUI:
     def __init__(self, root, on_webcam_change, on_toggle_detection, on_clear_word, on_submit_word, on_clear_history, on_backspace, on_confidence_change, on_space):
@@ -29,12 +29,24 @@ class ASLDetectorGUI:
         
         # Initialize variables
         self.video_frame = None
+        self.photo = None
         self.status_var = None
         self.webcam_var = None
         self.start_button = None
         self.word_var = None
         self.history_text = None
         self.confidence_var = None
+        self.confidence_text = "0.83"  # Text currently shown in the confidence label
+        self.history_tail = ()  # Words currently shown in the history widget
+        self.status_message = "Ready"  # Message currently shown in the status bar
+        
+        # Reusable display buffers: a binary PPM image (header + RGB pixels) with a
+        # numpy view over its pixels so the colour conversion writes straight into it
+        ppm_header = b"P6\n640 480\n255\n"
+        self.ppm_buffer = bytearray(ppm_header) + bytearray(640 * 480 * 3)
+        self.ppm_pixels = np.frombuffer(self.ppm_buffer, dtype=np.uint8,
+                                        offset=len(ppm_header)).reshape(480, 640, 3)
+        self.frame_resized = np.empty((480, 640, 3), dtype=np.uint8)
         
         # Create main container
         self.main_container = ttk.Frame(self.root)
@@ -114,13 +126,14 @@ class ASLDetectorGUI:
         self.history_text.pack(fill=tk.X, padx=5, pady=(0,5))
         self.history_text.config(state=tk.DISABLED)  # Make read-only
         
-        # Video Frame
-        self.video_frame = ttk.Label(self.main_container)
+        # Video Frame (a single photo image is reused for every frame)
+        self.photo = tk.PhotoImage(width=640, height=480)
+        self.video_frame = ttk.Label(self.main_container, image=self.photo)
         self.video_frame.pack(fill=tk.BOTH, expand=True)
         
         # Status bar
         self.status_var = tk.StringVar()
-        self.status_var.set("Ready")
+        self.status_var.set(self.status_message)
         status_bar = ttk.Label(self.main_container, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.pack(fill=tk.X, pady=(5, 0))
     
@@ -146,7 +159,11 @@ class ASLDetectorGUI:
     def _on_confidence_change(self, *args):
         """Handle confidence threshold changes"""
         value = self.confidence_var.get()
-        self.confidence_label.config(text=f"{value:.2f}")
+        text = f"{value:.2f}"
+        if text == self.confidence_text:
+            return  # Slider moved less than the displayed precision
+        self.confidence_text = text
+        self.confidence_label.config(text=text)
         self.on_confidence_change(value)
     
     def _on_space(self):
@@ -154,24 +171,32 @@ class ASLDetectorGUI:
         self.on_space()
     
     def update_video_frame(self, frame):
-        """Update the video frame with a new image"""
-        # Resize frame to 640x480 before displaying
-        frame_resized = cv2.resize(frame, (640, 480))
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(frame_rgb)
-        imgtk = ImageTk.PhotoImage(image=img)
-        self.video_frame.imgtk = imgtk
-        self.video_frame.configure(image=imgtk)
+        """Update the video frame with a new BGR image
+        
+        Resizing and RGB conversion write into buffers allocated once in __init__,
+        so callers can pass frames straight from OpenCV without converting them.
+        """
+        # Resize frame to 640x480 before displaying (skipped if already that size)
+        if frame.shape[1] == 640 and frame.shape[0] == 480:
+            frame_resized = frame
+        else:
+            frame_resized = cv2.resize(frame, (640, 480), dst=self.frame_resized)
+        # Convert to RGB directly into the PPM buffer and hand it to Tk, skipping PIL
+        cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB, dst=self.ppm_pixels)
+        self.photo.configure(data=bytes(self.ppm_buffer), format="PPM")
         
         # Update window size based on frame size
         if not self.root.winfo_ismapped():
             self.root.update_idletasks()
-            width = img.width + 20  # Add padding
-            height = img.height + 250  # Add space for controls and status bar
+            width = self.photo.width() + 20  # Add padding
+            height = self.photo.height() + 250  # Add space for controls and status bar
             self.root.geometry(f"{width}x{height}")
     
     def update_status(self, message):
         """Update the status bar message"""
+        if message == self.status_message:
+            return  # Avoid redrawing the status bar with the same text
+        self.status_message = message
         self.status_var.set(message)
     
     def update_word(self, word):
@@ -180,12 +205,16 @@ class ASLDetectorGUI:
     
     def update_word_history(self, history):
         """Update the word history display"""
+        tail = tuple(history[-3:])
+        if tail == self.history_tail:
+            return  # Displayed words are unchanged
+        self.history_tail = tail
+        
         self.history_text.config(state=tk.NORMAL)  # Enable editing
         self.history_text.delete(1.0, tk.END)  # Clear current content
         
-        # Show last 3 words (or fewer if less available)
-        for word in history[-3:]:
-            self.history_text.insert(tk.END, word + "\n")
+        # Show last 3 words (or fewer if less available) with a single insert
+        self.history_text.insert(tk.END, "".join(word + "\n" for word in tail))
         
         self.history_text.config(state=tk.DISABLED)  # Make read-only again
     
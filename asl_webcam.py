@@ -1,24 +1,59 @@
 """
 Real-time ASL-letter detector
 ——————————————
- • Requires:  ultralytics, opencv-python, tkinter, pillow
+ • Requires:  ultralytics, opencv-python, tkinter
  • Usage:    python asl_webcam.py
 """
 
 from ultralytics import YOLO
-import cv2, time, os
+from ultralytics.engine.results import Boxes
+from ultralytics.utils import ops
+import cv2, time, os, sys, queue, threading, logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import torch
 import tkinter as tk
 from asl_gui import ASLDetectorGUI
 from datetime import datetime
+from types import SimpleNamespace
+
+try:
+    from deepsparse import Pipeline  # Optional sparse CPU runtime for pruned/quantized ONNX models
+except ImportError:
+    Pipeline = None
+
+logger = logging.getLogger(__name__)
+
+STATUS = object()  # Queued in place of a frame to show the message that comes with it
+CLEAR_WORDS = object()  # Queued for the words writer to empty the words file
+STOP_WRITER = object()  # Queued for the words writer to close the file and exit
 
 class ASLDetectorApp:
     def __init__(self):
         # --- configuration ---
-        self.WEIGHTS = "weights/mixed_v3.pt"  # Path to the trained YOLO model
+        self.WEIGHTS = "weights/mixed_v3.pt"  # Path to the trained YOLO model (exported copies are preferred)
         self.CONF_TH = 0.83  # Confidence threshold for detection (83%)
+        self.IMGSZ = 480  # Starting inference image size (frames are letterboxed down to this)
+        self.IMGSZ_TIERS = (640, 480, 320)  # Sizes the .pt model steps through as inference time changes
+        self.STEP_UP_LOAD = 0.4  # Step the size up when the model uses less than this share of a frame's time
+        self.SIZE_PATIENCE = 30  # Consecutive frames over or well under budget before changing size
         self.FONT = cv2.FONT_HERSHEY_SIMPLEX  # Font for text display
         self.COL_LABEL = (0, 255, 0)  # Green color for labels (BGR format)
         self.COL_BOX = (0, 255, 255)  # Yellow color for bounding boxes (BGR format)
+        self.FRAME_W, self.FRAME_H = 640, 480  # Capture resolution requested from the webcam
+        self.CAM_FPS = 30  # Capture frame rate requested from the webcam
+        # Native capture backend for the platform (DirectShow on Windows, V4L2 on Linux)
+        self.CAM_BACKEND = {"win32": cv2.CAP_DSHOW, "linux": cv2.CAP_V4L2}.get(sys.platform, cv2.CAP_ANY)
+        self.TARGET_FPS = 30  # Maximum frames per second sent to the model and shown in the GUI
+        self.SHOW_FPS = False  # Draw the measured FPS in the top-left corner of the video
+        self.INFER_EVERY = 2  # Run the model on every Nth frame, reusing its boxes in between
+        # Frames per model call on GPU (.pt weights only). A batch holds its first frame back for
+        # BATCH_SIZE * INFER_EVERY - 1 capture periods, so only raise this when the model, not
+        # the camera, limits the frame rate
+        self.BATCH_SIZE = 1
+        # torch.compile the network on GPU (.pt weights only; first start is slower). Its
+        # Triton backend isn't available on Windows, so compile elsewhere only
+        self.COMPILE = sys.platform != "win32"
         
         # Word spelling configuration
         self.HOLD_TIME = 1.0  # Time in seconds to hold a sign before adding to word
@@ -26,17 +61,71 @@ class ASLDetectorApp:
         self.last_detected_letter = None  # Last letter detected by the model
         self.letter_hold_start = None  # Time when current letter detection started
         self.word_history = []  # List to store history of spelled words
+        self.WORDS_FILE = "words/spelled_words.txt"  # File where submitted words are saved
         
-        # Create directory for saving spelled words
+        # Create directory for saving spelled words and open the file here, so a missing
+        # permission fails at startup; a background thread does the writing
         os.makedirs("words", exist_ok=True)
+        self.words_file = open(self.WORDS_FILE, "a", encoding="utf-8")
+        self.words_queue = queue.Queue()  # Lines to save, CLEAR_WORDS or STOP_WRITER
+        self.words_errors = queue.Queue()  # Write errors from the words writer, shown by the GUI
+        self.words_writer = threading.Thread(target=self._words_writer_loop, daemon=True)
+        self.words_writer.start()
         
         # Initialize variables
         self.cap = None  # Video capture object
-        self.model = YOLO(self.WEIGHTS)  # Load the YOLO model
+        self.device = 0 if torch.cuda.is_available() else "cpu"  # First GPU if present
+        # FP16 inference on GPUs with tensor cores (compute capability 7.0+), .pt weights only
+        self.half = torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 7
+        if torch.cuda.is_available():
+            # Frames always have the same shape, so let cuDNN pick the fastest kernels once
+            torch.backends.cudnn.benchmark = True
+        else:
+            # Leave cores free for Tk and OpenCV when inference runs on the CPU
+            torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        self.gpu_preprocess = torch.cuda.is_available()  # Letterbox frames on the GPU instead of the CPU
+        self.pad_square = True  # Pad frames to a full imgsz square (exported models have a fixed input shape)
+        self.stride = 32  # Padded frame sides must be a multiple of the network's largest stride
+        self.sparse_pipeline = None  # DeepSparse pipeline used instead of the YOLO model, if loaded
+        self.imgsz = self.IMGSZ  # Current inference size
+        self.imgsz_tiers = sorted(set(self.IMGSZ_TIERS) | {self.IMGSZ}, reverse=True)  # Largest first
+        self.adaptive_imgsz = False  # Whether imgsz may change (exported models have a fixed size)
+        self.slow_frames = 0  # Consecutive frames whose inference took longer than the frame budget
+        self.fast_frames = 0  # Consecutive frames whose inference used under STEP_UP_LOAD of the budget
+        self.untimed_runs = 0  # Model runs left out of infer_ms_ewma after an input shape change
+        self.batch_size = 1  # Frames per model call, set when the model is loaded
+        self.compiled_network = None  # Predictor network whose layers were torch.compiled
+        self.eager_network = None  # Its uncompiled layers, restored if compiling fails
+        self.model_notice = None  # Exported models that failed to load, shown once the GUI is up
+        self.warmed_up = False  # Whether warm_up() has run (the compiled network is built on its first run)
+        self.model = self.load_model()  # Load the YOLO model
+        self.class_names = [self.model.names[i] for i in range(len(self.model.names))]  # Letter per class index
+        self.label_prefixes = [name + " " for name in self.class_names]  # Static part of each box label
+        self.label_cache = {}  # Box labels keyed by (class index, score in tenths of a percent)
+        self.glyphs, self.glyph_ascent = self.build_glyphs()  # Pre-rendered label characters
         self.is_running = False  # Flag to track if detection is running
+        self.last_frame_time = None  # Time when the last frame was processed
+        self.latest_frame = None  # Newest frame from the grab thread (None if it failed)
+        self.frame_lock = threading.Lock()  # Guards latest_frame
+        self.new_frame = threading.Event()  # Set when the grab thread has a frame not yet processed
+        self.infer_ms_ewma = None  # Smoothed model inference time per displayed frame in milliseconds
+        self.frames_read = 0  # Frames read since detection started
+        self.fps = 0.0  # Smoothed rate of frames sent to the GUI
+        self.last_fps_time = None  # perf_counter_ns() when the previous frame was sent
+        self.frame_ns_ewma = None  # Smoothed interval between frames sent to the GUI in nanoseconds
+        self.fps_sprite = None  # Pre-rendered FPS text, redrawn only when the shown value changes
+        self.fps_mask = None  # Pixels of fps_sprite covered by text
+        self.fps_shown = None  # FPS value rendered in fps_sprite
+        self.last_boxes = None  # Boxes from the most recent model run, drawn on skipped frames
+        self.frame_queue = queue.Queue(maxsize=2)  # Annotated frames from the inference thread
+        self.stop_event = threading.Event()  # Signals the grab and inference threads to stop
+        self.grab_thread = None  # Background thread reading the webcam
+        self.inference_thread = None  # Background thread running the model
         
         # Create root window and GUI
         self.root = tk.Tk()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Escape>", self.on_escape)
         self.gui = ASLDetectorGUI(
             self.root,
             on_webcam_change=self.on_webcam_change,
@@ -51,23 +140,163 @@ class ASLDetectorApp:
         
         # Initialize available webcams
         self.initialize_webcams()
+        self.root.after(500, self.check_words_writer)
+    
+    def find_weights(self):
+        """List exported models next to WEIGHTS suited to this machine, fastest first"""
+        base = os.path.splitext(self.WEIGHTS)[0]
+        if torch.cuda.is_available():
+            candidates = [base + "_int8.engine", base + ".engine"]  # TensorRT INT8, then FP16
+        else:
+            candidates = [base + "_sparse.onnx"] if Pipeline is not None else []  # Pruned + INT8 (DeepSparse)
+            candidates.append(base + "_int8_openvino_model")  # INT8 OpenVINO (uses VNNI on recent CPUs)
+        candidates.append(base + ".onnx")
+        return [path for path in candidates if os.path.exists(path)]
+    
+    def load_model(self):
+        """Load the fastest available version of the YOLO model"""
+        failed = []
+        for weights in self.find_weights():
+            try:
+                if weights.endswith("_sparse.onnx"):
+                    # The sparse model is run by DeepSparse; the .pt model still supplies class names
+                    self.sparse_pipeline = Pipeline.create(task="yolov8", model_path=weights)
+                    self.run_sparse([np.zeros((self.IMGSZ, self.IMGSZ, 3), dtype=np.uint8)])
+                    return YOLO(self.WEIGHTS)
+                model = YOLO(weights, task="detect")
+                # Exported backends load lazily, so run one frame to be sure this one works.
+                # They run at the precision they were exported with (TensorRT reads it from
+                # the engine), and half=True would feed FP16 input to an FP32 .onnx
+                model(np.zeros((self.IMGSZ, self.IMGSZ, 3), dtype=np.uint8), imgsz=self.IMGSZ,
+                      device=self.device, half=False, verbose=False)
+                if self.gpu_preprocess:
+                    # Frames reach the model as GPU tensors at runtime, so check that path too
+                    with torch.inference_mode():
+                        self.run_network(model, [np.zeros((self.FRAME_H, self.FRAME_W, 3), dtype=np.uint8)])
+                self.half = False
+                return model
+            except Exception as e:
+                self.sparse_pipeline = None
+                logger.warning("Could not load %s (%s), trying the next model", weights, e)
+                failed.append(os.path.basename(weights))
+                self.model_notice = f"could not load {', '.join(failed)}, see the log"
+        
+        model = YOLO(self.WEIGHTS)
+        model.fuse()  # Fuse Conv+BN layers
+        self.adaptive_imgsz = True
+        # The PyTorch model takes any multiple of its stride, so skip padding to a square
+        self.pad_square = False
+        self.stride = int(model.model.stride.max())
+        if torch.cuda.is_available():
+            # Exported models have a fixed batch of 1, but the PyTorch model can
+            # batch frames to amortize per-call GPU overhead
+            self.batch_size = self.BATCH_SIZE
+            # Run one frame so Ultralytics sets up the network run_network() calls directly
+            model(np.zeros((self.IMGSZ, self.IMGSZ, 3), dtype=np.uint8), imgsz=self.IMGSZ,
+                  device=self.device, half=self.half, verbose=False)
+            if self.COMPILE and hasattr(torch, "compile"):
+                # Compile that network for the fixed frame shape. CUDA graphs remove the
+                # per-layer launch overhead; compilation happens during warm_up().
+                network = model.predictor.model
+                self.compiled_network, self.eager_network = network, network.model
+                network.model = torch.compile(network.model, mode="reduce-overhead", dynamic=False)
+                # Every new input size would trigger a recompile, so keep the size fixed
+                self.adaptive_imgsz = False
+        return model
+    
+    def build_glyphs(self):
+        """Pre-render every character a box label can contain
+        
+        Returns a dict of character -> (tile, mask) and the distance from the
+        top of a tile to the text baseline.
+        """
+        chars = set("".join(self.label_prefixes)) | set("0123456789.%")
+        sizes = {ch: cv2.getTextSize(ch, self.FONT, 0.7, 2) for ch in chars}
+        ascent = max(size[1] for size, _ in sizes.values()) + 2
+        height = ascent + max(baseline for _, baseline in sizes.values()) + 2
+        
+        glyphs = {}
+        for ch, ((width, _), _) in sizes.items():
+            tile = np.zeros((height, width + 2, 3), dtype=np.uint8)
+            cv2.putText(tile, ch, (1, ascent), self.FONT, 0.7, self.COL_LABEL, 2, cv2.LINE_AA)
+            glyphs[ch] = (tile, tile.any(axis=2, keepdims=True))
+        return glyphs, ascent
+    
+    def draw_label(self, frame, label, x, y):
+        """Blit a label from the glyph tiles with its baseline starting at (x, y)"""
+        tiles = [self.glyphs[ch] for ch in label]
+        sprite = np.hstack([tile for tile, _ in tiles])
+        mask = np.hstack([mask for _, mask in tiles])
+        
+        # Clip the sprite to the frame (labels of boxes at the edges stick out)
+        top, left = y - self.glyph_ascent, x - 1
+        y0, y1 = max(top, 0), min(top + sprite.shape[0], frame.shape[0])
+        x0, x1 = max(left, 0), min(left + sprite.shape[1], frame.shape[1])
+        if y0 >= y1 or x0 >= x1:
+            return
+        np.copyto(frame[y0:y1, x0:x1], sprite[y0 - top:y1 - top, x0 - left:x1 - left],
+                  where=mask[y0 - top:y1 - top, x0 - left:x1 - left])
     
     def initialize_webcams(self):
-        """Find and list all available webcams in the system"""
-        available_webcams = []
-        for i in range(10):  # Check first 10 indices for webcams
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_webcams.append(f"Webcam {i}")
-                cap.release()
-        self.gui.set_webcam_list(available_webcams)
+        """Find and list all available webcams in the background so the GUI can start"""
+        self.gui.update_status("Searching for webcams...")
+        result = {}  # Filled by the search thread with "webcams" or "error"
+        search = threading.Thread(target=self._webcam_search, args=(result,), daemon=True)
+        search.start()
+        self.root.after(50, self._check_webcam_search, search, result)
+    
+    def _webcam_search(self, result):
+        """Store the found webcams, or the error that stopped the search, in result (runs on a worker thread)"""
+        try:
+            result["webcams"] = self.find_webcams()
+        except Exception as e:
+            logger.exception("Webcam search failed")
+            result["error"] = e
+    
+    def _check_webcam_search(self, search, result):
+        """Fill the webcam dropdown once the background search has finished"""
+        if search.is_alive():
+            self.root.after(50, self._check_webcam_search, search, result)
+            return
+        if "error" in result:
+            self.gui.update_status(f"Error: Could not search for webcams ({result['error']})")
+            return
+        self.gui.set_webcam_list(result["webcams"])
+        self.gui.update_status(f"Ready ({self.model_notice})" if self.model_notice else "Ready")
+    
+    def find_webcams(self):
+        """Probe all webcam indices at once, since each probe mostly waits on the driver"""
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            labels = executor.map(self.probe_webcam, range(10))  # Check first 10 indices for webcams
+        return [label for label in labels if label is not None]
+    
+    def probe_webcam(self, index):
+        """Return the dropdown label for the webcam at the given index, or None if it can't be opened"""
+        cap = cv2.VideoCapture(index, self.CAM_BACKEND)
+        found = cap.isOpened()
+        cap.release()
+        return f"Webcam {index}" if found else None
+    
+    def open_webcam(self, webcam_index):
+        """Open a webcam and configure it for low-latency capture at the display resolution"""
+        cap = cv2.VideoCapture(webcam_index, self.CAM_BACKEND)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))  # Compressed on the camera, less USB bandwidth
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't queue up stale frames in the driver
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.FRAME_W)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.FRAME_H)
+        cap.set(cv2.CAP_PROP_FPS, self.CAM_FPS)
+        return cap
     
     def on_webcam_change(self, webcam_index):
         """Handle webcam selection change from GUI"""
         if self.is_running:
             self.stop_detection()
+        if self.inference_thread or self.grab_thread:
+            # Open the new webcam once the old one has been released
+            self.root.after(50, self.on_webcam_change, webcam_index)
+            return
         
-        self.cap = cv2.VideoCapture(webcam_index)
+        self.cap = self.open_webcam(webcam_index)
         if not self.cap.isOpened():
             self.gui.update_status(f"Error: Could not open webcam {webcam_index}")
             return
@@ -82,29 +311,66 @@ class ASLDetectorApp:
     
     def start_detection(self):
         """Start the ASL detection process"""
+        if self.inference_thread or self.grab_thread:
+            self.gui.update_status("Previous detection is still stopping, try again in a moment")
+            return
         if not self.cap:
             webcam_index = self.gui.get_selected_webcam()
             if webcam_index is None:
                 self.gui.update_status("Please select a webcam first")
                 return
-            self.cap = cv2.VideoCapture(webcam_index)
+            self.cap = self.open_webcam(webcam_index)
             if not self.cap.isOpened():
                 self.gui.update_status(f"Error: Could not open webcam {webcam_index}")
                 return
         
+        self.last_frame_time = None
+        self.latest_frame = None
+        self.new_frame.clear()
+        self.infer_ms_ewma = None
+        self.frames_read = 0
+        self.last_boxes = None
+        self.fps = 0.0
+        self.last_fps_time = None
+        self.frame_ns_ewma = None
+        self.slow_frames = self.fast_frames = 0
+        self.untimed_runs = 0
         self.is_running = True
         self.gui.update_start_button(True)
         self.gui.update_status("Detection is running")
+        
+        # Run capture and inference in the background so Tk stays responsive
+        # Room for two batches, including the skipped frames published with each
+        self.frame_queue = queue.Queue(maxsize=2 * self.batch_size * self.INFER_EVERY)
+        self.stop_event.clear()
+        self.grab_thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self.grab_thread.start()
+        self.inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
+        self.inference_thread.start()
         self.update_frame()
     
-    def stop_detection(self):
-        """Stop the ASL detection process and release resources"""
+    def stop_detection(self, status="Detection stopped"):
+        """Stop the ASL detection process and release resources once the worker threads exit"""
         self.is_running = False
         self.gui.update_start_button(False)
+        self.stop_event.set()
+        self.gui.update_status("Stopping detection...")
+        self.finish_stop(status)
+    
+    def finish_stop(self, status):
+        """Release the webcam and show status, or check again shortly if a worker thread is still running
+        
+        Polling instead of joining keeps Tk responsive while the inference thread
+        finishes a long call such as the first torch.compile run.
+        """
+        if any(t.is_alive() for t in (self.inference_thread, self.grab_thread) if t):
+            self.root.after(50, self.finish_stop, status)
+            return
+        self.inference_thread = self.grab_thread = None
         if self.cap:
             self.cap.release()
             self.cap = None
-        self.gui.update_status("Detection stopped")
+        self.gui.update_status(status)
     
     def clear_word(self):
         """Clear the current word and reset letter detection state"""
@@ -128,7 +394,7 @@ class ASLDetectorApp:
         self.word_history = []
         self.gui.update_word_history(self.word_history)
         # Clear the file
-        open("words/spelled_words.txt", "w").close()
+        self.words_queue.put(CLEAR_WORDS)
         self.gui.update_status("Word history cleared")
     
     def submit_word(self):
@@ -139,8 +405,7 @@ class ASLDetectorApp:
             
             # Save to file with timestamp
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open("words/spelled_words.txt", "a", encoding="utf-8") as f:
-                f.write(f"{timestamp}: {self.current_word}\n")
+            self.words_queue.put(f"{timestamp}: {self.current_word}\n")
             
             # Update GUI
             self.gui.update_status(f"Submitted word: {self.current_word}")
@@ -151,66 +416,415 @@ class ASLDetectorApp:
         else:
             self.gui.update_status("No word to submit")
     
+    def _words_writer_loop(self):
+        """Save submitted words to WORDS_FILE until stopped (runs on a worker thread)"""
+        with self.words_file as words_file:
+            while True:
+                try:
+                    item = self.words_queue.get(timeout=1.0)
+                except queue.Empty:
+                    item = None  # Nothing new for a second, write out what is buffered
+                if item is STOP_WRITER:
+                    break
+                try:
+                    if item is None:
+                        words_file.flush()
+                    elif item is CLEAR_WORDS:
+                        words_file.truncate(0)
+                    else:
+                        words_file.write(item)
+                except OSError as e:
+                    logger.exception("Could not write %s", self.WORDS_FILE)
+                    self.words_errors.put(e)
+    
+    def check_words_writer(self):
+        """Show any write error from the words writer, then check again shortly"""
+        try:
+            error = self.words_errors.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self.gui.update_status(f"Error: Could not save words ({error})")
+        self.root.after(500, self.check_words_writer)
+    
     def handle_letter_detection(self, letter, score):
         """Handle letter detection for word spelling with hold time"""
-        current_time = time.time()
+        hold_start = self.letter_hold_start
+        current_time = time.perf_counter()
         
         if letter != self.last_detected_letter:
             # New letter detected, start hold timer
             self.last_detected_letter = letter
             self.letter_hold_start = current_time
             self.gui.update_status(f"Detected {letter} - Hold to add to word")
-        elif self.letter_hold_start and (current_time - self.letter_hold_start) >= self.HOLD_TIME:
-            # Letter held long enough, add to word
-            self.current_word += letter
-            self.gui.update_word(self.current_word)
-            self.gui.update_status(f"Added {letter} to word: {self.current_word}")
-            self.letter_hold_start = None  # Reset hold timer
-    
-    def update_frame(self):
-        """Update the video frame with detection results"""
-        if not self.is_running:
             return
-            
-        # Read frame from webcam
-        ok, frame = self.cap.read()
-        if not ok:
-            self.gui.update_status("Error: Could not read frame")
-            self.stop_detection()
+        
+        # Same letter: nothing to do until the hold time has passed (or after it was added)
+        if hold_start is None or current_time - hold_start < self.HOLD_TIME:
             return
+        
+        # Letter held long enough, add to word
+        self.current_word += letter
+        self.gui.update_word(self.current_word)
+        self.gui.update_status(f"Added {letter} to word: {self.current_word}")
+        self.letter_hold_start = None  # Reset hold timer
+    
+    def _grab_loop(self):
+        """Keep reading the webcam so the newest frame is always ready (runs on a worker thread)"""
+        try:
+            while not self.stop_event.is_set():
+                ok, frame = self.cap.read()
+                with self.frame_lock:
+                    self.latest_frame = frame if ok else None
+                    self.new_frame.set()
+                if not ok:
+                    return
+        except Exception:
+            logger.exception("Webcam read failed")
+            # Hand over a missing frame so the inference thread reports the error
+            with self.frame_lock:
+                self.latest_frame = None
+                self.new_frame.set()
+    
+    def read_frame(self):
+        """Take the newest frame from the grab thread, waiting until one is available"""
+        while not self.new_frame.wait(0.1):
+            if self.stop_event.is_set():
+                return False, None
+        with self.frame_lock:
+            frame = self.latest_frame
+            self.latest_frame = None
+            self.new_frame.clear()
+        self.last_frame_time = time.perf_counter()
+        return frame is not None, frame
+    
+    def _publish(self, item):
+        """Queue an item for the GUI, dropping the oldest one if the queue is full"""
+        while True:
+            try:
+                self.frame_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def send_frame(self, frame, detections):
+        """Measure the send rate, stamp the frame with it if SHOW_FPS is on, and queue it for the GUI"""
+        now = time.perf_counter_ns()
+        if self.last_fps_time is not None:
+            # Smooth the interval rather than the instantaneous rate: frames sent back to
+            # back (a batch, or a skipped frame after a slow model run) have near-zero
+            # intervals that would otherwise dominate the average
+            interval = now - self.last_fps_time
+            if self.frame_ns_ewma is None:
+                self.frame_ns_ewma = interval
+            else:
+                self.frame_ns_ewma = 0.9 * self.frame_ns_ewma + 0.1 * interval
+            self.fps = 1e9 / max(1, self.frame_ns_ewma)
+        self.last_fps_time = now
+        
+        if self.SHOW_FPS:
+            # Re-render the FPS text only when the whole-number value changes, then blit it
+            fps_value = round(self.fps)
+            if fps_value != self.fps_shown:
+                self.fps_sprite = np.zeros((35, 150, 3), dtype=np.uint8)
+                cv2.putText(self.fps_sprite, f"FPS: {fps_value}", (10, 25), self.FONT, 0.7,
+                            self.COL_LABEL, 2, cv2.LINE_AA)
+                self.fps_mask = self.fps_sprite.any(axis=2, keepdims=True)
+                self.fps_shown = fps_value
+            np.copyto(frame[:35, :150], self.fps_sprite, where=self.fps_mask)
+        self._publish((frame, detections))
+    
+    def warm_up(self):
+        """Run the model twice on blank frames shaped like the webcam's to tune GPU kernels"""
+        ok, frame = self.read_frame()
+        if not ok:
+            return  # The inference loop reports the read error
+        blank = [np.zeros_like(frame)] * self.batch_size
+        try:
+            for _ in range(2):
+                self.run_model(blank)
+        except Exception as e:
+            if self.eager_network is None:
+                raise
+            # Compiling failed (e.g. no working Triton/compiler), fall back to the eager network
+            logger.warning("torch.compile failed (%s), running the network uncompiled", e)
+            self.compiled_network.model = self.eager_network
+            self.compiled_network = self.eager_network = None
+            self.adaptive_imgsz = True
+            for _ in range(2):
+                self.run_model(blank)
+        self.warmed_up = True
+    
+    def preprocess_gpu(self, frames):
+        """Letterbox BGR frames into a normalized RGB batch on the GPU
+        
+        Returns the batch plus the (left, top) padding and scale that map boxes back to the frames.
+        """
+        h, w = frames[0].shape[:2]
+        scale = self.imgsz / max(h, w)
+        new_h, new_w = round(h * scale), round(w * scale)
+        if self.pad_square:
+            pad_h = pad_w = self.imgsz
+        else:
+            # Pad only up to the next stride multiple, e.g. 640x480 at imgsz 480 runs as 480x384
+            pad_h = -(-new_h // self.stride) * self.stride
+            pad_w = -(-new_w // self.stride) * self.stride
+        top, left = (pad_h - new_h) // 2, (pad_w - new_w) // 2
+        
+        # One upload per frame of the raw uint8 pixels, everything else runs on the GPU
+        batch = torch.stack([torch.from_numpy(f).to(self.device, non_blocking=True) for f in frames])
+        batch = batch.flip(-1).permute(0, 3, 1, 2).float().div_(255)  # BGR->RGB, BHWC->BCHW, 0-1
+        batch = torch.nn.functional.interpolate(batch, size=(new_h, new_w), mode="bilinear",
+                                                align_corners=False)
+        padded = torch.full((len(frames), 3, pad_h, pad_w), 114 / 255, device=batch.device)
+        padded[:, :, top:top + new_h, left:left + new_w] = batch
+        return padded, (left, top), scale
+    
+    def run_network(self, model, frames):
+        """Letterbox BGR frames on the GPU and run the network and NMS, returning results shaped like Ultralytics'
+        
+        Calling the network directly skips YOLO.__call__, which would sync on the
+        tensor and copy the padded batch back to the CPU for Results.orig_img.
+        """
+        batch, offset, scale = self.preprocess_gpu(frames)
+        predictor = model.predictor
+        preds = predictor.model(batch)  # Casts to FP16 itself when the network runs in half precision
+        dets = ops.non_max_suppression(preds, self.CONF_TH, predictor.args.iou,
+                                       max_det=predictor.args.max_det)
+        results = [SimpleNamespace(boxes=Boxes(det, frame.shape[:2])) for det, frame in zip(dets, frames)]
+        return results, offset, scale
+    
+    def run_sparse(self, frames):
+        """Run the DeepSparse pipeline on BGR frames, returning results shaped like Ultralytics'"""
+        output = self.sparse_pipeline(images=frames, conf_thres=self.CONF_TH)
+        results = []
+        for frame, boxes, scores, labels in zip(frames, output.boxes, output.scores, output.labels):
+            # Rows of (x1, y1, x2, y2, conf, cls) in frame coordinates, like Boxes.data
+            data = np.array([[*box, score, float(label)] for box, score, label in zip(boxes, scores, labels)],
+                            dtype=np.float32).reshape(-1, 6)
+            results.append(SimpleNamespace(boxes=Boxes(torch.from_numpy(data), frame.shape[:2])))
+        return results
+    
+    def run_model(self, frames):
+        """Run the model on BGR frames, returning the results and the padding and scale of their boxes"""
+        if self.sparse_pipeline is not None:
+            return self.run_sparse(frames), (0, 0), 1.0
+        
+        # Covers our own GPU preprocessing as well as the model call
+        with torch.inference_mode():
+            if self.gpu_preprocess:
+                return self.run_network(self.model, frames)
+            results = self.model(frames, conf=self.CONF_TH, imgsz=self.imgsz, device=self.device,
+                                 half=self.half, verbose=False)
+        return results, (0, 0), 1.0
+    
+    def _inference_loop(self):
+        """Run inference until stopped, passing any error on to the GUI (runs on a worker thread)"""
+        try:
+            self.run_inference()
+        except Exception as e:
+            logger.exception("Inference failed")
+            if not self.stop_event.is_set():
+                self._publish((None, f"Error: Inference failed ({e})"))
+    
+    def run_inference(self):
+        """Read frames and run the model until stopped or a frame can't be read"""
+        if torch.cuda.is_available():
+            # Tk has nothing to show until warm-up finishes, so say why through the queue
+            compiling = self.compiled_network is not None and not self.warmed_up
+            self._publish((STATUS, "Preparing model (first run is slow)..." if compiling
+                           else "Preparing model..."))
+            self.warm_up()
+            if compiling and self.compiled_network is None:
+                self._publish((STATUS, "Detection is running (could not compile the model, running it uncompiled)"))
+            else:
+                self._publish((STATUS, "Detection is running"))
+        while not self.stop_event.is_set():
+            frames = []  # Frames to run the model on
+            pending = []  # Every frame read for this batch in capture order, with whether it is skipped
+            while len(frames) < self.batch_size:
+                # Wait until the next frame is due to keep inference at TARGET_FPS
+                if self.last_frame_time is not None:
+                    delay = 1.0 / self.TARGET_FPS - (time.perf_counter() - self.last_frame_time)
+                    if delay > 0 and self.stop_event.wait(delay):
+                        return
+                
+                # Read frame from webcam
+                ok, frame = self.read_frame()
+                if not ok:
+                    if not self.stop_event.is_set():
+                        self._publish((None, "Error: Could not read frame"))
+                    return
+                self.frames_read += 1
+                
+                skipped = bool(self.frames_read % self.INFER_EVERY) and self.last_boxes is not None
+                pending.append((frame, skipped))
+                if not skipped:
+                    frames.append(frame)
             
-        # Run YOLO model inference on the frame
-        results = self.model(frame, conf=self.CONF_TH, verbose=False)[0]
-        
-        # Process each detected sign
-        for box in results.boxes:
-            # Get detection details
-            cls = int(box.cls[0])  # Class index of detected letter
-            score = float(box.conf[0])  # Confidence score
-            x1, y1, x2, y2 = map(int, box.xyxy[0])  # Bounding box coordinates
+            # Run YOLO model inference on the batch of frames
+            infer_start = time.perf_counter()
+            results, offset, scale = self.run_model(frames)
+            infer_ms = (time.perf_counter() - infer_start) * 1000 / (len(frames) * self.INFER_EVERY)
+            if self.untimed_runs:
+                self.untimed_runs -= 1  # First run at a new size includes one-off kernel setup
+            elif self.infer_ms_ewma is None:
+                self.infer_ms_ewma = infer_ms
+            else:
+                self.infer_ms_ewma = 0.9 * self.infer_ms_ewma + 0.1 * infer_ms
             
-            # Draw bounding box
-            cv2.rectangle(frame, (x1, y1), (x2, y2), self.COL_BOX, 2)
+            # Send frames in the order they were captured, so skipped frames show the
+            # boxes of the inferred frame just before them
+            results = iter(results)
+            for frame, skipped in pending:
+                if skipped:
+                    # Show the last boxes but don't report them again, so the hold
+                    # timer only advances on frames the model actually saw
+                    self.draw_detections(frame, self.last_boxes)
+                    self.send_frame(frame, [])
+                    continue
+                self.last_boxes = self.extract_boxes(next(results).boxes, offset, scale)
+                detections = self.draw_detections(frame, self.last_boxes)
+                self.send_frame(frame, detections)
             
+            if self.adaptive_imgsz:
+                self.adapt_imgsz(len(frames))
+    
+    def adapt_imgsz(self, n_frames):
+        """Step the inference size down while the model can't keep up with TARGET_FPS, and back up when it can
+        
+        Uses the measured model time rather than the displayed FPS, which is capped
+        by the camera and TARGET_FPS and includes frames the model skipped.
+        """
+        if self.infer_ms_ewma is None:
+            return  # No timing at the current size yet
+        budget_ms = 1000 / self.TARGET_FPS
+        if self.infer_ms_ewma > budget_ms:
+            self.slow_frames += n_frames
+            self.fast_frames = 0
+        elif self.infer_ms_ewma < budget_ms * self.STEP_UP_LOAD:
+            self.fast_frames += n_frames
+            self.slow_frames = 0
+        else:
+            self.slow_frames = self.fast_frames = 0
+        
+        tier = self.imgsz_tiers.index(self.imgsz)
+        if self.slow_frames >= self.SIZE_PATIENCE and tier < len(self.imgsz_tiers) - 1:
+            tier += 1
+        elif self.fast_frames >= self.SIZE_PATIENCE and tier > 0:
+            tier -= 1
+        else:
+            return
+        
+        # Time the new size from scratch, leaving out its first run
+        self.imgsz = self.imgsz_tiers[tier]
+        self.slow_frames = self.fast_frames = 0
+        self.infer_ms_ewma = None
+        self.untimed_runs = 1
+    
+    def extract_boxes(self, boxes, offset=(0, 0), scale=1.0):
+        """Convert model boxes into a list of ((x1, y1, x2, y2), cls, score) on the frame
+        
+        Box coordinates are mapped back onto the frame by removing the letterbox
+        offset and dividing by the scale the frame was resized with.
+        """
+        if not len(boxes):
+            return []  # Nothing detected, skip the tensor copies
+        
+        # Copy all detection details (x1, y1, x2, y2, conf, cls rows) to the CPU in one transfer
+        data = boxes.data.cpu().numpy()
+        left, top = offset
+        xyxy = ((data[:, :4] - (left, top, left, top)) / scale)
+        xyxy = xyxy.astype(np.int32).tolist()  # Bounding box coordinates
+        confs = data[:, 4].tolist()  # Confidence scores
+        clss = data[:, 5].astype(np.int32).tolist()  # Class indices of detected letters
+        return list(zip(xyxy, clss, confs))
+    
+    def draw_detections(self, frame, boxes):
+        """Draw extracted boxes onto the frame and return them as (letter, score) pairs"""
+        if not boxes:
+            return []
+        
+        # Draw all bounding boxes with a single OpenCV call
+        corners = [np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.int32)
+                   for (x1, y1, x2, y2), _, _ in boxes]
+        cv2.polylines(frame, corners, True, self.COL_BOX, 2)
+        
+        # Look up per-box constants once instead of through self on every box
+        names, prefixes, label_cache = self.class_names, self.label_prefixes, self.label_cache
+        
+        # Label each detected sign
+        detections = []
+        for (x1, y1, x2, y2), cls, score in boxes:
             # Get letter name and create label
-            letter = self.model.names[cls]
-            label = f"{letter} {score*100:0.1f}%"
+            letter = names[cls]
+            tenths = round(score * 1000)
+            label = label_cache.get((cls, tenths))
+            if label is None:
+                label = label_cache[(cls, tenths)] = f"{prefixes[cls]}{tenths / 10:0.1f}%"
             
             # Draw label above box
-            cv2.putText(frame, label, (x1, y1-8), self.FONT, 0.7, self.COL_LABEL, 2,
-                        cv2.LINE_AA)
+            self.draw_label(frame, label, x1, y1-8)
             
-            # Handle letter detection for word spelling
+            detections.append((letter, score))
+        return detections
+    
+    def update_frame(self):
+        """Show the latest annotated frame from the inference thread"""
+        if not self.is_running:
+            return
+        
+        update_start = time.perf_counter()
+        try:
+            frame, detections = self.frame_queue.get_nowait()
+        except queue.Empty:
+            # Next frame is late, check again shortly
+            self.root.after(5, self.update_frame)
+            return
+        
+        # More than a batch behind (e.g. after a Tk stall): skip ahead to the newest batch,
+        # still passing on the letters of the frames skipped so the hold timer sees them
+        backlog = self.batch_size * self.INFER_EVERY
+        while frame is not None and frame is not STATUS and self.frame_queue.qsize() >= backlog:
+            for letter, score in detections:
+                self.handle_letter_detection(letter, score)
+            frame, detections = self.frame_queue.get_nowait()
+        
+        if frame is None:
+            # The inference thread stopped on an error; detections holds its message
+            self.stop_detection(detections)
+            return
+        if frame is STATUS:
+            self.gui.update_status(detections)
+            self.root.after(1, self.update_frame)
+            return
+        
+        # Handle letter detection for word spelling
+        for letter, score in detections:
             self.handle_letter_detection(letter, score)
         
         # Update GUI with processed frame
         self.gui.update_video_frame(frame)
         
-        # Schedule next frame update
-        self.root.after(10, self.update_frame)
+        # Schedule next frame update for when the next frame should be ready
+        self.root.after(self.next_frame_delay(update_start), self.update_frame)
+    
+    def next_frame_delay(self, update_start):
+        """Milliseconds until the next frame is expected from the inference thread"""
+        frame_ms = 1000 / self.TARGET_FPS
+        if self.infer_ms_ewma is not None:
+            frame_ms = max(frame_ms, self.infer_ms_ewma)
+        elapsed_ms = (time.perf_counter() - update_start) * 1000
+        return max(1, int(frame_ms - elapsed_ms))
     
     def on_confidence_change(self, value):
         """Handle confidence threshold changes from GUI"""
+        value = round(value, 2)  # Match the precision shown in the GUI
+        if value == self.CONF_TH:
+            return
         self.CONF_TH = value
         self.gui.update_status(f"Confidence threshold set to {value:.2f}")
     
@@ -220,12 +834,30 @@ class ASLDetectorApp:
         self.gui.update_word(self.current_word)
         self.gui.update_status("Added space")
     
+    def on_escape(self, event=None):
+        """Stop detection when Esc is pressed"""
+        if self.is_running:
+            self.stop_detection()
+    
+    def on_close(self):
+        """Stop detection, flush saved words and close the window"""
+        if self.is_running:
+            self.stop_detection()
+        if self.inference_thread or self.grab_thread:
+            # Close once the worker threads have exited and the webcam is released
+            self.root.after(50, self.on_close)
+            return
+        self.words_queue.put(STOP_WRITER)
+        self.words_writer.join()
+        self.root.destroy()
+    
     def run(self):
         """Start the application main loop"""
         self.root.mainloop()
 
 def main():
     """Main entry point of the application"""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     app = ASLDetectorApp()
     app.run()
 